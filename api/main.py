@@ -1,34 +1,45 @@
 """
 FastAPI wrapper for maptoposter - generates beautiful map posters via API.
 """
+import asyncio
+import contextlib
+import hashlib
+import json
 import os
-import subprocess
+import sys
 import base64
-import uuid
+import time
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from enum import StrEnum
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from pydantic import BaseModel, Field
 
 app = FastAPI(
     title="Map Poster API",
     description="Generate beautiful, minimalist map posters for any city",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson serializes in native code; it matters most for the multi-MB
+    # base64 payload, where pure-Python json escapes char-by-char
+    default_response_class=ORJSONResponse
 )
 
 # Available themes from maptoposter
-THEMES = [
+THEMES = (
     "noir", "blueprint", "midnight_blue", "neon_cyberpunk", "japanese_ink",
     "terracotta", "sunset", "warm_beige", "pastel_dream", "ocean",
     "forest", "emerald", "copper_patina", "monochrome_blue",
     "gradient_roads", "contrast_zones", "autumn"
-]
+)
 
 # Preset sizes (width x height in inches at 300 DPI)
-SIZES = {
+SIZES = MappingProxyType({
     "instagram": {"width": 3.6, "height": 3.6, "description": "1080x1080px"},
     "mobile": {"width": 3.6, "height": 6.4, "description": "1080x1920px"},
     "4k": {"width": 12.8, "height": 7.2, "description": "3840x2160px"},
@@ -36,20 +47,107 @@ SIZES = {
     "poster_small": {"width": 8, "height": 10, "description": "2400x3000px"},
     "poster_medium": {"width": 12, "height": 16, "description": "3600x4800px"},
     "poster_large": {"width": 18, "height": 24, "description": "5400x7200px"},
+})
+
+# Constant response bodies, built once instead of per request
+THEMES_RESPONSE = {
+    "themes": list(THEMES),
+    "count": len(THEMES),
+    "default": "noir"
+}
+SIZES_RESPONSE = {
+    "sizes": dict(SIZES),
+    "note": "You can also specify custom width/height in inches (max 20)"
 }
 
+# Enum views of the above so pydantic rejects unknown themes/sizes while
+# parsing the request body, before any handler code runs
+ThemeName = StrEnum("ThemeName", {name: name for name in THEMES})
+SizeName = StrEnum("SizeName", {name: name for name in SIZES})
+
 # Path to maptoposter script (in parent directory since we're in /api)
 REPO_ROOT = Path(__file__).parent.parent
 SCRIPT_PATH = REPO_ROOT / "create_map_poster.py"
 POSTERS_DIR = REPO_ROOT / "posters"
+# Created once here so the per-request path never pays the mkdir/stat syscall
+POSTERS_DIR.mkdir(parents=True, exist_ok=True)
+
+# Generation timeout in seconds (3 minutes for large posters)
+GENERATION_TIMEOUT = 180
+
+# Request fields that determine poster content; the cache key hashes exactly
+# these (with the resolved width/height, so size presets hit the same entry).
+CACHE_KEY_FIELDS = {
+    "city", "country", "theme", "distance",
+    "display_city", "display_country", "font_family",
+}
+
+# Cached posters beyond this total size are evicted oldest-first
+POSTER_CACHE_MAX_BYTES = int(os.environ.get("POSTER_CACHE_MAX_MB", "2048")) * 1024 * 1024
+
+# Admission control: renders are CPU- and memory-heavy, so only half the
+# cores generate at once; requests queued beyond MAX_QUEUED_REQUESTS are shed
+# with 503 + Retry-After instead of piling up behind the 180 s timeout.
+GENERATION_SEMAPHORE = asyncio.Semaphore(max(1, (os.cpu_count() or 1) // 2))
+MAX_QUEUED_REQUESTS = int(os.environ.get("POSTER_MAX_QUEUE", "8"))
+_queued_waiters = 0
+
+# Internal location prefix for nginx X-Accel-Redirect (e.g. "/internal/posters").
+# When set, poster bytes are streamed from disk to socket by nginx's sendfile
+# instead of being copied through Python buffers.
+ACCEL_REDIRECT_PREFIX = os.environ.get("POSTER_ACCEL_REDIRECT", "").rstrip("/")
+
+
+def _preimport():
+    """Warm up a worker process: pay matplotlib/osmnx import cost once."""
+    os.chdir(REPO_ROOT)
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    # Progress bars are per-request noise in a long-lived worker
+    os.environ.setdefault("TQDM_DISABLE", "1")
+    import matplotlib
+    matplotlib.use("Agg")
+    import create_map_poster  # noqa: F401
+
+
+def _generate_poster(params: dict, width: float, height: float, output_file: str) -> str:
+    """Run poster generation inside a worker process."""
+    import create_map_poster
+    # Render to a temp path and publish with an atomic rename: the cache
+    # treats the mere existence of {key}.png as a hit, so a worker killed
+    # mid-savefig must never leave a truncated file at the final path.
+    tmp_file = f"{output_file}.{os.getpid()}.tmp"
+    try:
+        # The generator prints per-step progress meant for CLI use; discard it
+        # rather than interleaving every request's chatter into the server
+        # log. Failures still surface as exceptions with their message intact.
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            create_map_poster.generate(params, width, height, output_file=tmp_file)
+        os.replace(tmp_file, output_file)
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_file)
+    return output_file
+
+
+# Long-lived worker pool so each request reuses a warm interpreter with
+# matplotlib/geopandas/osmnx already imported, instead of spawning a fresh
+# `uv run` subprocess per call.
+EXECUTOR = ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_preimport)
+
+
+@app.on_event("shutdown")
+def shutdown_executor():
+    """Release worker processes on shutdown."""
+    EXECUTOR.shutdown(wait=False, cancel_futures=True)
 
 
 class PosterRequest(BaseModel):
     """Request model for poster generation."""
     city: str = Field(..., description="City name", min_length=1)
     country: str = Field(..., description="Country name", min_length=1)
-    theme: str = Field(default="noir", description="Poster theme")
-    size: Optional[str] = Field(default=None, description="Preset size (instagram, mobile, 4k, a4, poster_small, poster_medium, poster_large)")
+    theme: ThemeName = Field(default=ThemeName.noir, description="Poster theme")
+    size: Optional[SizeName] = Field(default=None, description="Preset size (instagram, mobile, 4k, a4, poster_small, poster_medium, poster_large)")
     width: Optional[float] = Field(default=None, description="Custom width in inches (max 20)", le=20, ge=1)
     height: Optional[float] = Field(default=None, description="Custom height in inches (max 20)", le=20, ge=1)
     distance: Optional[int] = Field(default=18000, description="Map radius in meters")
@@ -66,6 +164,8 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/generate": "POST - Generate a map poster",
+            "/generate/async": "POST - Enqueue poster generation, returns a job id",
+            "/generate/{job_id}": "GET - Poll job status / fetch finished poster",
             "/themes": "GET - List available themes",
             "/sizes": "GET - List preset sizes",
             "/health": "GET - Health check"
@@ -73,103 +173,260 @@ async def root():
     }
 
 
+# /health is probed every few seconds by load balancers, and the script path
+# never changes while the process runs, so the body is computed once
+SCRIPT_EXISTS = SCRIPT_PATH.exists()
+HEALTH_RESPONSE = {
+    "status": "healthy" if SCRIPT_EXISTS else "degraded",
+    "script_found": SCRIPT_EXISTS,
+    "script_path": str(SCRIPT_PATH),
+    "started_at": datetime.utcnow().isoformat()
+}
+
+
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    script_exists = SCRIPT_PATH.exists()
-    return {
-        "status": "healthy" if script_exists else "degraded",
-        "script_found": script_exists,
-        "script_path": str(SCRIPT_PATH),
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return HEALTH_RESPONSE
 
 
 @app.get("/themes")
 async def list_themes():
     """List all available poster themes."""
-    return {
-        "themes": THEMES,
-        "count": len(THEMES),
-        "default": "noir"
-    }
+    return THEMES_RESPONSE
 
 
 @app.get("/sizes")
 async def list_sizes():
     """List all preset poster sizes."""
-    return {
-        "sizes": SIZES,
-        "note": "You can also specify custom width/height in inches (max 20)"
-    }
-
+    return SIZES_RESPONSE
 
-def run_poster_generation(request: PosterRequest, width: float, height: float) -> Path:
-    """Run the maptoposter script and return the path to generated file."""
 
-    # Ensure posters directory exists
-    POSTERS_DIR.mkdir(exist_ok=True)
+def resolve_dimensions(request: PosterRequest) -> tuple[float, float]:
+    """Resolve the poster dimensions in inches (theme/size validity is enforced
+    by pydantic when the request body is parsed)."""
+    if request.size:
+        preset = SIZES[request.size]
+        return preset["width"], preset["height"]
+
+    if request.width and request.height:
+        return request.width, request.height
+
+    # Default to poster_medium
+    return 12, 16
+
+
+def poster_cache_key(params: dict, width: float, height: float) -> str:
+    """Content hash of all request fields that affect the rendered poster."""
+    key_params = {field: params[field] for field in CACHE_KEY_FIELDS}
+    key_params["width"] = width
+    key_params["height"] = height
+    return hashlib.sha256(json.dumps(key_params, sort_keys=True).encode()).hexdigest()
+
+
+def evict_poster_cache():
+    """Delete oldest cached posters until the cache fits POSTER_CACHE_MAX_BYTES."""
+    entries = []
+    total = 0
+    with os.scandir(POSTERS_DIR) as it:
+        for entry in it:
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+    if total <= POSTER_CACHE_MAX_BYTES:
+        return
+
+    for _mtime, size, path in sorted(entries):
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        STAT_CACHE.pop(path, None)
+        total -= size
+        if total <= POSTER_CACHE_MAX_BYTES:
+            break
+
+
+# In-flight generations keyed by cache key, so concurrent identical requests
+# coalesce onto one render instead of duplicating the work
+INFLIGHT: dict[str, asyncio.Task] = {}
+
+
+async def run_poster_generation(request: PosterRequest, width: float, height: float) -> Path:
+    """Dispatch poster generation to the worker pool and return the output path."""
+
+    # Dump the request once; the same dict feeds the cache key and the worker
+    params = request.model_dump(mode="json")
+
+    # Content-addressed output path: identical requests map to the same file,
+    # so a cache hit skips generation entirely, and concurrent jobs for the
+    # same theme can never pick up each other's file.
+    key = poster_cache_key(params, width, height)
+    output_file = POSTERS_DIR / f"{key}.png"
+    if output_file.exists():
+        return output_file
+
+    # Single-flight: the render runs in its own task that every caller -
+    # including the one that started it - merely awaits through a shield, so
+    # one client disconnecting cancels only its own await, never the shared
+    # render the other coalesced requests are waiting on.
+    task = INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.create_task(
+            _generate_uncached(params, width, height, output_file)
+        )
+        # Retrieve the exception even if every awaiter got cancelled, so no
+        # "exception was never retrieved" warning fires
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        task.add_done_callback(lambda _t: INFLIGHT.pop(key, None))
+        INFLIGHT[key] = task
 
-    # Build command
-    cmd = [
-        "uv", "run", str(SCRIPT_PATH),
-        "--city", request.city,
-        "--country", request.country,
-        "--theme", request.theme,
-        "--width", str(width),
-        "--height", str(height),
-        "--distance", str(request.distance),
-    ]
+    return await asyncio.shield(task)
 
-    # Add optional parameters
-    if request.display_city:
-        cmd.extend(["--display-city", request.display_city])
-    if request.display_country:
-        cmd.extend(["--display-country", request.display_country])
-    if request.font_family:
-        cmd.extend(["--font-family", request.font_family])
 
-    try:
-        # Run maptoposter from repo root
-        result = subprocess.run(
-            cmd,
-            cwd=str(REPO_ROOT),
-            capture_output=True,
-            text=True,
-            timeout=180  # 3 minute timeout for large posters
+async def _generate_uncached(params: dict, width: float, height: float,
+                             output_file: Path) -> Path:
+    """Render one poster through the admission gate and worker pool."""
+    global _queued_waiters
+    if GENERATION_SEMAPHORE.locked() and _queued_waiters >= MAX_QUEUED_REQUESTS:
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy generating posters, please retry later",
+            headers={"Retry-After": "30"}
         )
 
-        if result.returncode != 0:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Poster generation failed: {result.stderr}"
-            )
-
-        # Find the generated file
-        if not POSTERS_DIR.exists():
-            raise HTTPException(
-                status_code=500,
-                detail="Poster output directory not found"
+    loop = asyncio.get_running_loop()
+    try:
+        _queued_waiters += 1
+        try:
+            await GENERATION_SEMAPHORE.acquire()
+        finally:
+            _queued_waiters -= 1
+
+        # A running pool task cannot be cancelled, so a timed-out render keeps
+        # occupying its worker. Tie the permit to the worker future itself:
+        # it is released when the render truly ends, not when we stop waiting,
+        # otherwise admission control would over-admit onto busy workers.
+        try:
+            worker_future = EXECUTOR.submit(
+                _generate_poster, params, width, height, str(output_file)
             )
+        except Exception:
+            GENERATION_SEMAPHORE.release()
+            raise
+        worker_future.add_done_callback(
+            lambda _f: loop.call_soon_threadsafe(GENERATION_SEMAPHORE.release)
+        )
 
-        # Get the most recent file matching our request
-        poster_files = list(POSTERS_DIR.glob(f"*_{request.theme}_*.png"))
-
-        if not poster_files:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Generated poster file not found. stdout: {result.stdout}"
-            )
+        await asyncio.wait_for(
+            asyncio.wrap_future(worker_future, loop=loop),
+            timeout=GENERATION_TIMEOUT,
+        )
 
-        # Get the most recently created file
-        latest_file = max(poster_files, key=lambda f: f.stat().st_mtime)
-        return latest_file
+        await asyncio.to_thread(evict_poster_cache)
+        return output_file
 
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         raise HTTPException(
             status_code=504,
             detail="Poster generation timed out"
         )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Poster generation failed: {e}"
+        )
+
+
+# base64 maps 3 input bytes to 4 output chars, so a read size that is a
+# multiple of 3 (57 KiB here) lets each chunk encode cleanly with no carry.
+B64_CHUNK_SIZE = 57 * 1024
+
+
+def encode_file_base64(path: Path) -> str:
+    """
+    Base64-encode a file in chunks into a preallocated buffer.
+
+    Avoids holding the raw bytes and the encoded string in memory at once;
+    peak overhead is the ~1.33x encoded buffer instead of ~2.33x.
+    """
+    size = path.stat().st_size
+    encoded = bytearray(((size + 2) // 3) * 4)
+    offset = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(B64_CHUNK_SIZE), b""):
+            block = base64.b64encode(chunk)
+            encoded[offset:offset + len(block)] = block
+            offset += len(block)
+    return encoded.decode("ascii")
+
+
+# Cached os.stat results for served posters, so high-hit-rate files do not
+# get re-stat'ed for Content-Length/Last-Modified/ETag on every response.
+# Poster files are content-addressed and never rewritten in place; the TTL
+# just keeps entries for evicted files from lingering.
+STAT_CACHE: dict[str, tuple[os.stat_result, float]] = {}
+STAT_CACHE_TTL = 60
+STAT_CACHE_MAX_ENTRIES = 1024
+
+
+def cached_stat(path: Path) -> os.stat_result:
+    """Return a possibly-cached os.stat result for a poster file."""
+    now = time.monotonic()
+    entry = STAT_CACHE.get(str(path))
+    if entry is not None and now - entry[1] < STAT_CACHE_TTL:
+        return entry[0]
+
+    if len(STAT_CACHE) >= STAT_CACHE_MAX_ENTRIES:
+        for key in [k for k, (_, at) in STAT_CACHE.items() if now - at >= STAT_CACHE_TTL]:
+            del STAT_CACHE[key]
+        # Nothing (or not enough) expired: evict oldest entries so the
+        # bound holds even under a burst of distinct hot files
+        excess = len(STAT_CACHE) - STAT_CACHE_MAX_ENTRIES + 1
+        if excess > 0:
+            for key in sorted(STAT_CACHE, key=lambda k: STAT_CACHE[k][1])[:excess]:
+                del STAT_CACHE[key]
+
+    result = os.stat(path)
+    STAT_CACHE[str(path)] = (result, now)
+    return result
+
+
+class PosterFileResponse(FileResponse):
+    """
+    FileResponse reading 1 MiB chunks instead of Starlette's 64 KiB default,
+    cutting read/send syscall pairs ~16x on multi-MB posters.
+    """
+    chunk_size = 1 << 20
+
+
+def poster_file_response(path: Path, filename: str, headers: dict) -> Response:
+    """
+    Build the response serving a generated poster file.
+
+    With POSTER_ACCEL_REDIRECT set, emits an X-Accel-Redirect so the fronting
+    nginx serves the file via kernel sendfile (zero user-space copies);
+    otherwise falls back to a regular FileResponse.
+    """
+    if ACCEL_REDIRECT_PREFIX:
+        return Response(
+            media_type="image/png",
+            headers={
+                **headers,
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "X-Accel-Redirect": f"{ACCEL_REDIRECT_PREFIX}/{path.name}",
+            },
+        )
+
+    return PosterFileResponse(
+        path=str(path),
+        media_type="image/png",
+        filename=filename,
+        headers=headers,
+        stat_result=cached_stat(path)
+    )
 
 
 @app.post("/generate")
@@ -178,42 +435,19 @@ async def generate_poster(request: PosterRequest):
     Generate a map poster for the specified city.
     Returns the generated PNG image file.
     """
-    # Validate theme
-    if request.theme not in THEMES:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid theme '{request.theme}'. Available themes: {', '.join(THEMES)}"
-        )
-
-    # Determine dimensions
-    if request.size:
-        if request.size not in SIZES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid size '{request.size}'. Available sizes: {', '.join(SIZES.keys())}"
-            )
-        width = SIZES[request.size]["width"]
-        height = SIZES[request.size]["height"]
-    elif request.width and request.height:
-        width = request.width
-        height = request.height
-    else:
-        # Default to poster_medium
-        width = 12
-        height = 16
+    width, height = resolve_dimensions(request)
 
     try:
-        latest_file = run_poster_generation(request, width, height)
+        latest_file = await run_poster_generation(request, width, height)
 
         # Generate unique filename for response
-        unique_id = str(uuid.uuid4())[:8]
+        unique_id = secrets.token_hex(4)
         response_filename = f"{request.city}_{request.country}_{request.theme}_{unique_id}.png"
 
         # Return the file
-        return FileResponse(
-            path=str(latest_file),
-            media_type="image/png",
-            filename=response_filename,
+        return poster_file_response(
+            latest_file,
+            response_filename,
             headers={
                 "X-Poster-City": request.city,
                 "X-Poster-Country": request.country,
@@ -229,46 +463,119 @@ async def generate_poster(request: PosterRequest):
         )
 
 
-@app.post("/generate/base64")
-async def generate_poster_base64(request: PosterRequest):
+# In-process job registry for async generation. Jobs run on the same warm
+# worker pool; finished entries are pruned after JOB_TTL seconds.
+JOBS: dict[str, dict] = {}
+JOB_TTL = 3600
+
+
+def _prune_jobs():
+    """Drop finished jobs older than JOB_TTL."""
+    cutoff = time.time() - JOB_TTL
+    for job_id in [
+        job_id for job_id, job in JOBS.items()
+        if job["status"] in ("done", "failed") and job["created_at"] < cutoff
+    ]:
+        del JOBS[job_id]
+
+
+async def _run_job(job_id: str, request: PosterRequest, width: float, height: float):
+    """Drive one queued job to completion, recording its outcome."""
+    job = JOBS[job_id]
+    job["status"] = "running"
+    try:
+        job["path"] = await run_poster_generation(request, width, height)
+    except HTTPException as e:
+        job["status"] = "failed"
+        job["error"] = e.detail
+    except Exception as e:
+        job["status"] = "failed"
+        job["error"] = str(e)
+    else:
+        job["status"] = "done"
+
+
+@app.post("/generate/async", status_code=202)
+async def generate_poster_async(request: PosterRequest):
     """
-    Generate a map poster and return as base64 string.
-    Useful for n8n workflows that need to process the image data.
+    Enqueue poster generation and return immediately with a job id.
+    Poll GET /generate/{job_id} for status and the finished file.
+    Avoids holding the HTTP connection open for the whole render.
     """
-    # Validate theme
-    if request.theme not in THEMES:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid theme '{request.theme}'. Available themes: {', '.join(THEMES)}"
+    width, height = resolve_dimensions(request)
+
+    _prune_jobs()
+    job_id = secrets.token_hex(16)
+    JOBS[job_id] = {
+        "status": "queued",
+        "created_at": time.time(),
+        "request": request,
+        "path": None,
+        "error": None,
+        "task": None,
+    }
+    JOBS[job_id]["task"] = asyncio.create_task(_run_job(job_id, request, width, height))
+
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "result": f"/generate/{job_id}"
+    }
+
+
+@app.get("/generate/{job_id}")
+async def get_generated_poster(job_id: str):
+    """Return job status, or the finished poster once generation is done."""
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job id '{job_id}'")
+
+    if job["status"] == "failed":
+        return ORJSONResponse(
+            {"job_id": job_id, "status": "failed", "error": job["error"]},
+            status_code=500
         )
 
-    # Determine dimensions
-    if request.size:
-        if request.size not in SIZES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid size '{request.size}'. Available sizes: {', '.join(SIZES.keys())}"
-            )
-        width = SIZES[request.size]["width"]
-        height = SIZES[request.size]["height"]
-    elif request.width and request.height:
-        width = request.width
-        height = request.height
-    else:
-        width = 12
-        height = 16
+    if job["status"] != "done":
+        return {"job_id": job_id, "status": job["status"]}
+
+    request = job["request"]
+    unique_id = secrets.token_hex(4)
+    response_filename = f"{request.city}_{request.country}_{request.theme}_{unique_id}.png"
+
+    return poster_file_response(
+        job["path"],
+        response_filename,
+        headers={
+            "X-Poster-City": request.city,
+            "X-Poster-Country": request.country,
+            "X-Poster-Theme": request.theme
+        }
+    )
+
+
+@app.post("/generate/base64", deprecated=True)
+async def generate_poster_base64(request: PosterRequest):
+    """
+    Generate a map poster and return as base64 string.
+
+    Deprecated: prefer POST /generate, which returns the PNG directly with a
+    Content-Disposition filename. base64 inflates the payload by ~33% and
+    costs encode/decode CPU on both ends; n8n's HTTP Request node handles
+    binary responses natively (Response -> File).
+    """
+    width, height = resolve_dimensions(request)
 
     try:
-        latest_file = run_poster_generation(request, width, height)
+        latest_file = await run_poster_generation(request, width, height)
 
-        # Read and encode as base64
-        with open(latest_file, "rb") as f:
-            image_data = base64.b64encode(f.read()).decode("utf-8")
+        # Encode as base64 (off the event loop: posters are multi-MB)
+        image_data = await asyncio.to_thread(encode_file_base64, latest_file)
 
-        unique_id = str(uuid.uuid4())[:8]
+        unique_id = secrets.token_hex(4)
         filename = f"{request.city}_{request.country}_{request.theme}_{unique_id}.png"
 
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "filename": filename,
             "city": request.city,
@@ -290,4 +597,23 @@ async def generate_poster_base64(request: PosterRequest):
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Default to a single worker: each uvicorn worker owns a render pool
+    # sized to the CPU count, so extra workers multiply render processes
+    workers = int(os.environ.get("WORKERS", 1))
+    if workers > 1:
+        # The job registry, in-flight map and admission semaphore are all
+        # per-process: with several workers a GET /generate/{job_id} routed
+        # to a different worker 404s on a live job. Scale with replicas
+        # behind a load balancer instead until that state is shared.
+        raise SystemExit(
+            "WORKERS>1 is not supported: job and coalescing state is kept "
+            "in-process. Run multiple replicas instead."
+        )
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+    )
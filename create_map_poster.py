@@ -772,6 +772,73 @@ def create_poster(
     print(f"✓ Done! Poster saved as {output_file}")
 
 
+def generate(params, width=12, height=16, output_file=None):
+    """
+    Programmatic entry point for poster generation.
+
+    Mirrors the CLI flow: resolves coordinates, loads the theme, renders the
+    poster and returns the output path. Intended for long-lived callers (such
+    as the API) that import this module once and keep the interpreter warm
+    instead of paying startup and import cost per poster.
+
+    Args:
+        params: Mapping with "city" and "country" (required) plus optional
+            "theme", "distance", "display_city", "display_country" and
+            "font_family" keys matching the CLI flags.
+        width: Poster width in inches (default: 12)
+        height: Poster height in inches (default: 16)
+        output_file: Optional explicit output path. When omitted, a
+            timestamped filename under the posters directory is used.
+
+    Returns:
+        Path to the generated PNG file as a string.
+
+    Raises:
+        ValueError: If the theme is unknown or the city cannot be geocoded.
+        RuntimeError: If street network data cannot be retrieved.
+    """
+    global THEME
+
+    city = params["city"]
+    country = params["country"]
+    theme_name = params.get("theme") or "terracotta"
+
+    available_themes = get_available_themes()
+    if theme_name not in available_themes:
+        raise ValueError(
+            f"Theme '{theme_name}' not found. "
+            f"Available themes: {', '.join(available_themes)}"
+        )
+
+    custom_fonts = None
+    font_family = params.get("font_family")
+    if font_family:
+        custom_fonts = load_fonts(font_family)
+        if not custom_fonts:
+            print(f"⚠ Failed to load '{font_family}', falling back to Roboto")
+
+    coords = get_coordinates(city, country)
+    THEME = load_theme(theme_name)
+    if output_file is None:
+        output_file = generate_output_filename(city, theme_name, "png")
+    else:
+        output_file = str(output_file)
+    create_poster(
+        city,
+        country,
+        coords,
+        params.get("distance") or 18000,
+        output_file,
+        "png",
+        width,
+        height,
+        display_city=params.get("display_city"),
+        display_country=params.get("display_country"),
+        fonts=custom_fonts,
+    )
+    return output_file
+
+
 def print_examples():
     """Print usage examples."""
     print("""
@@ -955,6 +1022,12 @@ Examples:
         choices=["png", "svg", "pdf"],
         help="Output format for the poster (default: png)",
     )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        help="Output file path (default: posters/<city>_<theme>_<timestamp>.<format>)",
+    )
 
     args = parser.parse_args()
 
@@ -992,6 +1065,9 @@ Examples:
         sys.exit(1)
 
     if args.all_themes:
+        if args.output:
+            print("⚠ --output is ignored with --all-themes (one file per theme).")
+            args.output = None
         themes_to_generate = available_themes
     else:
         if args.theme not in available_themes:
@@ -1023,7 +1099,9 @@ Examples:
 
         for theme_name in themes_to_generate:
             THEME = load_theme(theme_name)
-            output_file = generate_output_filename(args.city, theme_name, args.format)
+            output_file = args.output or generate_output_filename(
+                args.city, theme_name, args.format
+            )
             create_poster(
                 args.city,
                 args.country,